@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
 
 # --- 1. Define the Shape to Draw ---
 # We need a list of complex numbers (x + iy) representing the path.
@@ -15,33 +16,53 @@ def get_heart_path(n_points):
     return x + 1j * y
 
 # Configuration
-n_points = 1000       # Resolution of the original shape
+n_points_fft = 1000   # Resolution of the original shape
+n_points_anim = 256   # Frames in one full cycle of the animation
+                      # (only needs to be well above 2 * the highest circle frequency)
 n_circles = 50        # How many circles to use (more = more accurate)
                       # Try changing this to 5, 20, or 100 to see the difference!
 
 # Get the path data
-path_data = get_heart_path(n_points)
+path_data = get_heart_path(n_points_fft)
 
 # --- 2. Compute the Discrete Fourier Transform (DFT) ---
 
 # This breaks the path down into frequencies.
 # 'coeffs' tells us the radius and starting angle of each circle.
 coeffs = np.fft.fft(path_data)
-coeffs = coeffs / n_points # Normalize
+coeffs = coeffs / n_points_fft # Normalize
 
 # We need the frequencies associated with each coefficient
-freqs = np.fft.fftfreq(n_points)
+freqs = np.fft.fftfreq(n_points_fft)
 
 # Sort the circles! 
 # We generally want to draw the largest circles first (the "fundamental" frequencies)
 # so the animation looks stable.
-indices = np.argsort(np.abs(coeffs))[::-1] # Sort by magnitude, descending
+# The magnitude of each coefficient is also the radius of its circle
+mags = np.abs(coeffs)
+
+# We only keep the n_circles biggest ones, so instead of sorting everything we
+# first pick those out (argpartition) and then sort just them, largest first
+indices = np.argpartition(mags, -n_circles)[-n_circles:]
+indices = indices[np.argsort(-mags[indices])]
 coeffs = coeffs[indices]
 freqs = freqs[indices]
 
-# Limit the number of circles to what we configured
-coeffs = coeffs[:n_circles]
-freqs = freqs[:n_circles]
+# The radius of each circle never changes, so work it out once
+radii = mags[indices]
+
+# Every circle is drawn with the same 50 points around it,
+# so the cos/sin of those angles only need computing once too
+theta = np.linspace(0, 2*np.pi, 50)
+THETA_COS = np.cos(theta)
+THETA_SIN = np.sin(theta)
+
+# Calculate the rotation of every circle at every frame ahead of time
+# The formula for a rotating vector is: c * e^(i * 2*pi * f * t)
+# 'frame' corresponds to time t, and t goes from 0 to 1 over the course of the animation
+# Row 'frame' of this table holds e^(i * 2*pi * f * t) for ALL circles at that time step
+t = np.arange(n_points_anim) / n_points_anim
+exponents = np.exp(1j * 2 * np.pi * np.outer(t, freqs * n_points_fft)).astype(np.complex64)
 
 # --- 3. Animation Setup ---
 
@@ -57,25 +78,22 @@ ax.set_ylim(-limit - 5, limit - 5)
 
 # Visual elements
 # The "epicycles" (the gray circles)
-circle_lines = [ax.plot([], [], 'w-', lw=0.5, alpha=0.3)[0] for _ in range(n_circles)]
+# All circles live in a single LineCollection, so matplotlib updates them in one go
+circles_lc = LineCollection([], colors='w', lw=0.5, alpha=0.3)
+ax.add_collection(circles_lc)
 # The "radius arms" (the lines connecting centers)
 radius_line, = ax.plot([], [], 'w-', lw=1, alpha=0.8)
 # The drawing tip (the final path)
 draw_path, = ax.plot([], [], 'm-', lw=2) # Magenta line
 
-path_x, path_y = [], []
+# The trail gets one point per frame, so we can make room for all of them up front
+path_x = np.empty(n_points_anim)
+path_y = np.empty(n_points_anim)
 
 def update(frame):
-    # 'frame' corresponds to time t
-    # t goes from 0 to 1 over the course of the animation
-    t = frame / n_points 
-    
     # Calculate the position of every circle center
-    # The formula for a rotating vector is: c * e^(i * 2*pi * f * t)
-    
-    # We compute terms for ALL circles at this time step
-    exponents = np.exp(1j * 2 * np.pi * freqs * t * n_points)
-    terms = coeffs * exponents
+    # The rotations were computed up front, so we just look up this frame's row
+    terms = coeffs * exponents[frame]
     
     # Cumulative sum to find the center of each circle
     # [c0, c0+c1, c0+c1+c2, ...]
@@ -90,27 +108,23 @@ def update(frame):
     
     # 2. Update the circles themselves
     # Each circle is centered at centers[i] with radius abs(coeffs[i])
-    for i in range(n_circles):
-        center = centers[i]
-        radius = np.abs(coeffs[i])
-        
-        # Generate points for a circle
-        theta = np.linspace(0, 2*np.pi, 50)
-        c_x = np.real(center) + radius * np.cos(theta)
-        c_y = np.imag(center) + radius * np.sin(theta)
-        
-        circle_lines[i].set_data(c_x, c_y)
+    # Points for all circles are generated at once: row i holds circle i
+    c_x = np.real(centers[:n_circles])[:, None] + radii[:, None] * THETA_COS[None, :]
+    c_y = np.imag(centers[:n_circles])[:, None] + radii[:, None] * THETA_SIN[None, :]
+
+    # Shape (n_circles, 50, 2): one list of (x, y) points per circle
+    circles_lc.set_segments(np.stack([c_x, c_y], axis=-1))
         
     # 3. Update the drawing path (trail)
     tip = centers[-1]
-    path_x.append(np.real(tip))
-    path_y.append(np.imag(tip))
-    draw_path.set_data(path_x, path_y)
+    path_x[frame] = np.real(tip)
+    path_y[frame] = np.imag(tip)
+    draw_path.set_data(path_x[:frame + 1], path_y[:frame + 1])
     
-    return circle_lines + [radius_line, draw_path]
+    return [circles_lc, radius_line, draw_path]
 
 # Create animation
-# frames = n_points corresponds to one full cycle (0 to 2*pi)
-anim = FuncAnimation(fig, update, frames=n_points, interval=20, blit=True)
+# frames = n_points_anim corresponds to one full cycle (0 to 2*pi)
+anim = FuncAnimation(fig, update, frames=n_points_anim, interval=20, blit=True)
 
 plt.show()
\ No newline at end of file
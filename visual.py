@@ -2,66 +2,105 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
+# Numba compiles the integration below to fast machine code.
+# Without it the same functions simply run as (slower) plain Python.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 # --- 1. Define the Differential Equations ---
 
-def lorenz(xyz, sigma=10, rho=28, beta=8/3):
-    x, y, z = xyz
+@njit(cache=True, fastmath=True)
+def lorenz(x, y, z, sigma=10, rho=28, beta=8/3):
     dx = sigma * (y - x)
     dy = x * (rho - z) - y
     dz = x * y - beta * z
-    return np.array([dx, dy, dz])
+    return dx, dy, dz
 
-def rossler(xyz, a=0.2, b=0.2, c=5.7):
-    x, y, z = xyz
+@njit(cache=True, fastmath=True)
+def rossler(x, y, z, a=0.2, b=0.2, c=5.7):
     dx = -y - z
     dy = x + a * y
     dz = b + z * (x - c)
-    return np.array([dx, dy, dz])
+    return dx, dy, dz
 
-def chen(xyz, a=40, b=3, c=28):
-    x, y, z = xyz
+@njit(cache=True, fastmath=True)
+def chen(x, y, z, a=40, b=3, c=28):
     dx = a * (y - x)
     dy = (c - a) * x - x * z + c * y
     dz = x * y - b * z
-    return np.array([dx, dy, dz])
+    return dx, dy, dz
 
-def aizawa(xyz, a=0.95, b=0.7, c=0.6, d=3.5, e=0.25, f=0.1):
-    x, y, z = xyz
+@njit(cache=True, fastmath=True)
+def aizawa(x, y, z, a=0.95, b=0.7, c=0.6, d=3.5, e=0.25, f=0.1):
     dx = (z - b) * x - d * y
     dy = d * x + (z - b) * y
     dz = c + a * z - (z**3 / 3) - (x**2 + y**2) * (1 + e * z) + f * z * x**3
-    return np.array([dx, dy, dz])
+    return dx, dy, dz
 
 # --- 2. Generate Data (Numerical Integration) ---
 
-def generate_data(func, initial_state, steps, dt):
-    traj = np.zeros((steps, 3))
-    traj[0] = initial_state
+# Compiled code can't be handed an arbitrary Python function,
+# so we pick the attractor by its index (the same order as 'titles' below)
+@njit(cache=True, fastmath=True)
+def derivative(x, y, z, which):
+    if which == 0:
+        return lorenz(x, y, z)
+    elif which == 1:
+        return rossler(x, y, z)
+    elif which == 2:
+        return chen(x, y, z)
+    else:
+        return aizawa(x, y, z)
+
+@njit(cache=True, fastmath=True)
+def rk4_step(x, y, z, which, dt):
+    # Runge-Kutta 4 (RK4) Integration
+    # This prevents the "overflow" errors by being much more precise
+    # Everything is plain numbers here, so no arrays are created at each step
+    k1x, k1y, k1z = derivative(x, y, z, which)
+    k2x, k2y, k2z = derivative(x + k1x * dt / 2, y + k1y * dt / 2, z + k1z * dt / 2, which)
+    k3x, k3y, k3z = derivative(x + k2x * dt / 2, y + k2y * dt / 2, z + k2z * dt / 2, which)
+    k4x, k4y, k4z = derivative(x + k3x * dt, y + k3y * dt, z + k3z * dt, which)
+
+    # Calculate weighted average
+    return (x + (k1x + 2*k2x + 2*k3x + k4x) * dt / 6,
+            y + (k1y + 2*k2y + 2*k3y + k4y) * dt / 6,
+            z + (k1z + 2*k2z + 2*k3z + k4z) * dt / 6)
+
+@njit(cache=True, fastmath=True)
+def generate_data(initial_states, steps, dt):
+    # All attractors are integrated together in one compiled loop,
+    # one row of 'initial_states' per attractor
+    n_systems = initial_states.shape[0]
+    traj = np.zeros((n_systems, steps, 3))
+    traj[:, 0] = initial_states
     for i in range(steps - 1):
-        # Runge-Kutta 4 (RK4) Integration
-        # This prevents the "overflow" errors by being much more precise
-        current = traj[i]
-        
-        k1 = func(current)
-        k2 = func(current + k1 * dt / 2)
-        k3 = func(current + k2 * dt / 2)
-        k4 = func(current + k3 * dt)
-        
-        # Calculate weighted average
-        traj[i + 1] = current + (k1 + 2*k2 + 2*k3 + k4) * dt / 6
-        
+        for k in range(n_systems):
+            x, y, z = rk4_step(traj[k, i, 0], traj[k, i, 1], traj[k, i, 2], k, dt)
+            traj[k, i + 1, 0] = x
+            traj[k, i + 1, 1] = y
+            traj[k, i + 1, 2] = z
+
     return traj
 
 # Configuration
 dt = 0.01
 steps = 3000
 loop_speed = 10 # Increase to skip frames for faster animation
+rotate_every = 0 # Move the camera every this many frames (0 = keep the camera still)
+                 # A still camera lets matplotlib redraw only the lines (blitting)
 
 # Generate the trajectories
-data_lorenz = generate_data(lorenz, [0.1, 0, 0], steps, dt)
-data_rossler = generate_data(rossler, [0.1, 0, 0], steps, dt)
-data_chen = generate_data(chen, [-0.1, 0.5, -0.6], steps, dt)
-data_aizawa = generate_data(aizawa, [0.1, 0, 0], steps, dt)
+initial_states = np.array([
+    [0.1, 0, 0],       # Lorenz
+    [0.1, 0, 0],       # Rössler
+    [-0.1, 0.5, -0.6], # Chen
+    [0.1, 0, 0],       # Aizawa
+])
+data_lorenz, data_rossler, data_chen, data_aizawa = generate_data(initial_states, steps, dt)
 
 datasets = [data_lorenz, data_rossler, data_chen, data_aizawa]
 titles = ["Lorenz", "Rössler", "Chen", "Aizawa"]
@@ -98,6 +137,9 @@ for i in range(4):
     ax.set_ylim(data[:,1].min(), data[:,1].max())
     ax.set_zlim(data[:,2].min(), data[:,2].max())
 
+    # Set the camera angle once here, rather than on every frame
+    ax.view_init(elev=30, azim=45)
+
 # --- 4. Animation Function ---
 
 def update(frame):
@@ -109,14 +151,20 @@ def update(frame):
         if current_step < len(data):
             line.set_data(data[:current_step, 0], data[:current_step, 1])
             line.set_3d_properties(data[:current_step, 2])
-            
-            # Optional: Rotate camera slightly for 3D effect
-            axes[i].view_init(elev=30, azim=current_step * 0.1)
+
+    # Optional: Rotate camera slightly for 3D effect
+    # Changing the view is expensive, so it only happens every few frames
+    if rotate_every and frame % rotate_every == 0:
+        for ax in axes:
+            ax.view_init(elev=30, azim=45 + current_step * 0.1)
             
     return lines
 
 # Create animation
-anim = FuncAnimation(fig, update, frames=steps//loop_speed, interval=20, blit=False)
+# With a still camera only the 4 lines change, so we let matplotlib redraw just those (blit)
+# Moving the camera changes the whole plot, so then every frame is redrawn in full
+anim = FuncAnimation(fig, update, frames=steps//loop_speed, interval=20,
+                     blit=not rotate_every, cache_frame_data=False)
 
 plt.tight_layout()
 plt.show()
\ No newline at end of file